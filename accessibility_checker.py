@@ -1,9 +1,14 @@
 # accessibility_checker.py - COMPLETE WORKING VERSION
 import asyncio
-from typing import Dict, List, Any
+import re
+from collections import Counter
+from typing import Dict, List, Any, Optional, FrozenSet
+
+import aiohttp
 
 try:
     from playwright.async_api import async_playwright
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
     from axe_core_python.async_playwright import Axe
     PLAYWRIGHT_AVAILABLE = True
     print("✅ Playwright + axe-core available")
@@ -11,14 +16,130 @@ except ImportError as e:
     PLAYWRIGHT_AVAILABLE = False
     print(f"⚠️ Playwright/axe-core not available: {e}")
 
+# Browser-like headers so sites don't reject the simple checker
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'br, gzip, deflate',  # aiohttp decodes br when Brotli is installed
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Fast-path scanners for the simple checker (non-empty alt / lang values only,
+# matching what the BeautifulSoup path treats as present)
+_ATTR_VALUE = rb'\s*=\s*(?:"[^"]+"|\'[^\']+\'|[^\s"\'>]+)'
+IMG_RE = re.compile(rb'<img\b([^>]*)>', re.I)
+ALT_RE = re.compile(rb'\salt' + _ATTR_VALUE, re.I)
+LANG_RE = re.compile(rb'<html\b[^>]*\slang' + _ATTR_VALUE, re.I)
+
+# Fix suggestions by axe rule id
+_FIXES = {
+    "document-title": "Add a descriptive <title> element in the <head> section.",
+    "image-alt": "Add alt text to images. Use alt='' for decorative images.",
+    "html-has-lang": "Add lang attribute to <html> tag, e.g., <html lang='en'>.",
+    "color-contrast": "Increase color contrast ratio to at least 4.5:1.",
+    "link-name": "Links should have descriptive text content.",
+    "button-name": "Buttons should have accessible names.",
+    "label": "Form inputs should have associated <label> elements.",
+    "aria-hidden-focus": "Don't hide focusable elements from screen readers."
+}
+
+# axe category tag -> display category (in priority order)
+_CAT_MAP = {
+    "cat.color": "Color",
+    "cat.forms": "Forms",
+    "cat.images": "Images",
+    "cat.language": "Language",
+    "cat.structure": "Structure"
+}
+
+# University penalty scale per violation impact (much stricter!)
+_PENALTIES = {
+    "critical": 15,  # Major legal risk
+    "serious": 10,   # Serious compliance issue
+    "moderate": 7,   # Moderate - still needs fixing
+    "minor": 4       # Minor - still unacceptable for universities
+}
+
+# axe options for fast mode: only violations/incomplete get full node lists.
+# Passes are still reported (one node each), so pass counts stay accurate.
+AXE_FAST_OPTIONS = {"resultTypes": ["violations", "incomplete"]}
+
+# Browser context options per device profile. Each URL gets its own short-lived
+# context built from these, so concurrent scans never share cookies or storage.
+CONTEXT_PROFILES = {
+    "desktop": {
+        "user_agent": BROWSER_HEADERS['User-Agent'],
+        "viewport": {"width": 1280, "height": 900}
+    }
+}
+
 class AccessibilityChecker:
     """Main accessibility checker"""
     
-    def __init__(self):
+    def __init__(self, fast_html: bool = True, fast_mode: bool = True):
         self.timeout = 30000
+        self.fast_html = fast_html  # Regex scan instead of a full BeautifulSoup tree
+        self.fast_mode = fast_mode  # Skip serializing every passing node in axe
+        self._pw = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        self._sem = asyncio.Semaphore(10)  # Max pages analyzed in parallel
+        self._http: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """Lazily create one pooled HTTP session for the simple checker"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                headers=BROWSER_HEADERS,
+                connector=aiohttp.TCPConnector(limit=50, ssl=False)
+            )
+        return self._http
     
-    async def check_url(self, url: str) -> Dict[str, Any]:
-        """Check a URL for accessibility issues"""
+    async def _ensure_browser(self):
+        """Lazily start one shared Chromium instance for all requests"""
+        async with self._browser_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                # Chromium crashed or disconnected - start a fresh one
+                print("⚠️ Browser disconnected, restarting Chromium")
+                await self._stop_browser()
+            if self._browser is None:
+                pw = await async_playwright().start()
+                try:
+                    self._browser = await pw.chromium.launch(headless=True)
+                except Exception:
+                    await pw.stop()  # Don't leak a driver process per failed launch
+                    raise
+                self._pw = pw
+        return self._browser
+    
+    async def _stop_browser(self):
+        """Close the browser and stop the Playwright driver, ignoring errors"""
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+    
+    async def close(self):
+        """Shut down the shared browser and HTTP session (called on app shutdown)"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        async with self._browser_lock:
+            await self._stop_browser()
+    
+    async def check_url(self, url: str, include_nodes: bool = True) -> Dict[str, Any]:
+        """Check a URL for accessibility issues (include_nodes=False omits example elements)"""
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
@@ -26,7 +147,7 @@ class AccessibilityChecker:
         if PLAYWRIGHT_AVAILABLE:
             try:
                 print(f"🔍 Using Playwright to analyze: {url}")
-                return await self._check_with_playwright(url)
+                return await self._check_with_playwright(url, include_nodes)
             except Exception as e:
                 print(f"⚠️ Playwright failed: {e}")
                 print("🔄 Falling back to simple checker...")
@@ -34,25 +155,38 @@ class AccessibilityChecker:
         # Fallback to simple checker
         return await self._check_with_simple(url)
     
-    async def _check_with_playwright(self, url: str) -> Dict[str, Any]:
+    async def check_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Check several URLs concurrently on the shared browser"""
+        return await asyncio.gather(*[self._bounded_check(url) for url in urls])
+    
+    async def _bounded_check(self, url: str) -> Dict[str, Any]:
+        """Check one URL while holding a concurrency slot"""
+        async with self._sem:
+            return await self.check_url(url)
+    
+    async def _check_with_playwright(self, url: str, include_nodes: bool = True,
+                                     profile: str = "desktop") -> Dict[str, Any]:
         """Use Playwright + axe-core"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
+        browser = await self._ensure_browser()
+        context = await browser.new_context(**CONTEXT_PROFILES[profile])
+        page = await context.new_page()
+        
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
             try:
-                await page.goto(url, wait_until="networkidle", timeout=self.timeout)
-                await page.wait_for_timeout(2000)
-                
-                axe = Axe()
-                results = await axe.run(page)
-                
-                return self._process_axe_results(url, results)
-                
-            finally:
-                await browser.close()
+                await page.wait_for_load_state("load", timeout=5000)
+            except PlaywrightTimeoutError:
+                pass  # Page never fired load (polling/analytics) - DOM is enough for axe
+            
+            axe = Axe()
+            results = await axe.run(page, options=AXE_FAST_OPTIONS if self.fast_mode else None)
+            
+            return self._process_axe_results(url, results, include_nodes)
+            
+        finally:
+            await context.close()
     
-    def _process_axe_results(self, url: str, axe_data: Dict) -> Dict[str, Any]:
+    def _process_axe_results(self, url: str, axe_data: Dict, include_nodes: bool = True) -> Dict[str, Any]:
         """Process axe-core results"""
         violations = axe_data.get("violations", [])
         incomplete = axe_data.get("incomplete", [])
@@ -62,40 +196,48 @@ class AccessibilityChecker:
         
         # Process violations
         for violation in violations:
-            node_count = len(violation.get("nodes", []))
-            issues.append({
+            nodes = violation.get("nodes") or ()
+            tags = frozenset(violation.get("tags") or ())
+            issue = {
                 "type": "critical",
                 "title": violation.get("id", "Violation").replace("-", " ").title(),
-                "count": node_count,
+                "count": len(nodes),
                 "description": violation.get("description", ""),
                 "help": violation.get("help", ""),
                 "helpUrl": violation.get("helpUrl", ""),
                 "impact": violation.get("impact", "moderate"),
                 "fix": self._get_fix_suggestion(violation.get("id", "")),
-                "category": self._get_category(violation.get("tags", [])),
-                "nodes": violation.get("nodes", [])[:2]
-            })
+                "category": self._get_category(tags)
+            }
+            if include_nodes:
+                issue["nodes"] = list(nodes[:2])
+            issues.append(issue)
         
         # Process incomplete
         for item in incomplete:
-            node_count = len(item.get("nodes", []))
+            nodes = item.get("nodes") or ()
+            tags = frozenset(item.get("tags") or ())
             issues.append({
                 "type": "warning",
                 "title": item.get("id", "Review").replace("-", " ").title(),
-                "count": node_count,
+                "count": len(nodes),
                 "description": f"Needs review: {item.get('description', '')}",
                 "impact": item.get("impact", "moderate"),
                 "fix": "Manual review required.",
-                "category": self._get_category(item.get("tags", []))
+                "category": self._get_category(tags)
             })
         
+        issues = issues[:20]  # Limit issues
+        nodes_table = self._dedupe_nodes(issues)
+        
         # Calculate score
         score = self._calculate_score(violations, incomplete, passes)
         
         return {
             "url": url,
             "score": score,
-            "issues": issues[:20],  # Limit issues
+            "issues": issues,
+            "nodes_table": nodes_table,
             "summary": self._generate_summary(violations, incomplete, score),
             "method": "axe-core",
             "violation_count": len(violations),
@@ -103,6 +245,33 @@ class AccessibilityChecker:
             "pass_count": len(passes)
         }
     
+    def _dedupe_nodes(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Move each issue's element data into a shared table.
+        
+        The same element often fails several rules; its html/target are
+        serialized once, keyed by (html, target). Each issue keeps a
+        {"node": index, "failureSummary": ...} entry, since the failure
+        reason is specific to that rule.
+        """
+        node_index: Dict[tuple, int] = {}
+        nodes_table: List[Dict[str, Any]] = []
+        for issue in issues:
+            nodes = issue.get("nodes")
+            if not nodes:
+                continue
+            refs = []
+            for node in nodes:
+                html = node.get("html", "")
+                target = node.get("target") or []
+                key = (html, tuple(map(str, target)))  # target parts may be lists (iframes/shadow DOM)
+                idx = node_index.get(key)
+                if idx is None:
+                    idx = node_index[key] = len(nodes_table)
+                    nodes_table.append({"html": html, "target": target})
+                refs.append({"node": idx, "failureSummary": node.get("failureSummary", "")})
+            issue["nodes"] = refs
+        return nodes_table
+    
     def _calculate_score(self, violations, incomplete, passes) -> int:
         """STRICT scoring for university compliance"""
         total = len(violations) + len(incomplete) + len(passes)
@@ -116,18 +285,9 @@ class AccessibilityChecker:
         score = 100
         
         # CRITICAL: Any violation is a major deduction
-        for v in violations:
-            impact = v.get("impact", "moderate").lower()
-            
-            # University penalty scale (much stricter!)
-            if impact == "critical":
-                score -= 15  # Major legal risk
-            elif impact == "serious":
-                score -= 10  # Serious compliance issue
-            elif impact == "moderate":
-                score -= 7   # Moderate - still needs fixing
-            else:  # minor
-                score -= 4   # Minor - still unacceptable for universities
+        # (axe impact values are already lowercase)
+        impacts = Counter((v.get("impact") or "moderate") for v in violations)
+        score -= sum(_PENALTIES.get(impact, 4) * n for impact, n in impacts.items())
         
         # Warnings also matter for universities
         score -= len(incomplete) * 3
@@ -149,49 +309,41 @@ class AccessibilityChecker:
     async def _check_with_simple(self, url: str) -> Dict[str, Any]:
         """Simple HTML checker fallback"""
         try:
-            import aiohttp
-            from bs4 import BeautifulSoup
-        
-            async with aiohttp.ClientSession() as session:
-                # ADD PROPER BROWSER HEADERS
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                }
+            session = await self._get_http()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status == 403:
+                    return self._error_result(url, f"Website blocked access (403 Forbidden)")
+                if resp.status != 200:
+                    return self._error_result(url, f"HTTP {resp.status}")
+                html_bytes = await resp.read()
+            
+            if self.fast_html:
+                # Single linear scan over the raw bytes - no DOM build
+                missing_alt = sum(1 for m in IMG_RE.finditer(html_bytes) if not ALT_RE.search(m.group(1)))
+                has_lang = bool(LANG_RE.search(html_bytes))
+            else:
+                # Parse with BeautifulSoup (lxml's C parser)
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(html_bytes, 'lxml')
+                missing_alt = sum(1 for img in soup.find_all('img') if not img.get('alt'))
+                html_tag = soup.find('html')
+                has_lang = bool(html_tag and html_tag.get('lang'))
             
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.get(url, timeout=10, ssl=False) as resp:
-                    if resp.status == 403:
-                        return self._error_result(url, f"Website blocked access (403 Forbidden)")
-                    if resp.status != 200:
-                        return self._error_result(url, f"HTTP {resp.status}")
-                    html = await resp.text()
-
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
             issues = []
             
             # Check images
-            images = soup.find_all('img')
-            images_no_alt = [img for img in images if not img.get('alt')]
-            if images_no_alt:
+            if missing_alt:
                 issues.append({
                     "type": "critical",
                     "title": "Missing Image Alt Text",
-                    "count": len(images_no_alt),
+                    "count": missing_alt,
                     "description": "Images without alt text",
                     "fix": "Add alt='description' to images",
                     "category": "Images"
                 })
             
             # Check lang attribute
-            html_tag = soup.find('html')
-            if not html_tag or not html_tag.get('lang'):
+            if not has_lang:
                 issues.append({
                     "type": "critical",
                     "title": "Missing Language Attribute",
@@ -216,31 +368,11 @@ class AccessibilityChecker:
     
     def _get_fix_suggestion(self, issue_id: str) -> str:
         """Get fix suggestion for issue"""
-        fixes = {
-            "document-title": "Add a descriptive <title> element in the <head> section.",
-            "image-alt": "Add alt text to images. Use alt='' for decorative images.",
-            "html-has-lang": "Add lang attribute to <html> tag, e.g., <html lang='en'>.",
-            "color-contrast": "Increase color contrast ratio to at least 4.5:1.",
-            "link-name": "Links should have descriptive text content.",
-            "button-name": "Buttons should have accessible names.",
-            "label": "Form inputs should have associated <label> elements.",
-            "aria-hidden-focus": "Don't hide focusable elements from screen readers."
-        }
-        return fixes.get(issue_id, "Review WCAG guidelines and fix accordingly.")
+        return _FIXES.get(issue_id, "Review WCAG guidelines and fix accordingly.")
     
-    def _get_category(self, tags: List[str]) -> str:
-        """Get category from tags"""
-        if "cat.color" in tags:
-            return "Color"
-        elif "cat.forms" in tags:
-            return "Forms"
-        elif "cat.images" in tags:
-            return "Images"
-        elif "cat.language" in tags:
-            return "Language"
-        elif "cat.structure" in tags:
-            return "Structure"
-        return "General"
+    def _get_category(self, tags: FrozenSet[str]) -> str:
+        """Get category from tags (first match in _CAT_MAP order)"""
+        return next((category for tag, category in _CAT_MAP.items() if tag in tags), "General")
     
     def _generate_summary(self, violations, incomplete, score) -> str:
         """Generate summary text"""
@@ -1,12 +1,20 @@
 # ai_analyzer.py - FIXED VERSION
 import os
 import json
+import hashlib
+from collections import OrderedDict
 from typing import Dict, List, Any
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Max cached AI analyses kept in memory (LRU)
+AI_CACHE_SIZE = 256
+
+# Decodes the first JSON object in a response and stops at its end
+_DECODER = json.JSONDecoder()
+
 class AIAccessibilityAnalyzer:
     """Use DeepSeek AI for accessibility insights"""
     
@@ -19,7 +27,7 @@ class AIAccessibilityAnalyzer:
         try:
             print(f"🤖 DEEPSEEK: Calling API with custom prompt ({len(prompt)} chars)...")
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="deepseek-chat",
                 messages=[
                     {"role": "system", "content": "You are a document accessibility expert specializing in PDF, Word, and text documents. Provide practical, tool-specific advice."},
@@ -36,10 +44,8 @@ class AIAccessibilityAnalyzer:
             try:
                 # Find JSON in response
                 start = content.find('{')
-                end = content.rfind('}') + 1
-                if start != -1 and end != 0:
-                    json_str = content[start:end]
-                    data = json.loads(json_str)
+                if start != -1:
+                    data, _ = _DECODER.raw_decode(content, start)
                     data["ai_source"] = "DeepSeek AI (Document Analysis)"
                     
                     # Add context if provided
@@ -80,7 +86,7 @@ class AIAccessibilityAnalyzer:
         
         if self.api_key and self.api_key.startswith("sk-"):
             print("✅ DEEPSEEK: Real API key detected!")
-            self.client = OpenAI(
+            self.client = AsyncOpenAI(
                 api_key=self.api_key,
                 base_url="https://api.deepseek.com"
             )
@@ -92,6 +98,21 @@ class AIAccessibilityAnalyzer:
                 print(f"   Key starts with sk-: {self.api_key.startswith('sk-')}")
             self.client = None
             self.available = False
+        
+        # Identical scans get the same advice - skip the API round-trip
+        self._ai_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
+    def _cache_key(self, url: str, score: int, issues: List[Dict]) -> str:
+        """Fingerprint a scan by URL, score and sorted issue titles"""
+        titles = ','.join(sorted(issue.get('title', '') for issue in issues))
+        return hashlib.blake2b(f"{url}|{score}|{titles}".encode(), digest_size=16).hexdigest()
+    
+    def _cache_store(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a result, evicting the least recently used entry when full"""
+        self._ai_cache[key] = result
+        if len(self._ai_cache) > AI_CACHE_SIZE:
+            self._ai_cache.popitem(last=False)
+        return result
     
     async def analyze_accessibility_results(self, 
                                           url: str, 
@@ -103,10 +124,21 @@ class AIAccessibilityAnalyzer:
         if not self.available:
             return self._mock_response(score, issues, "No API client")
         
+        key = self._cache_key(url, score, issues)
+        cached = self._ai_cache.get(key)
+        if cached is not None:
+            self._ai_cache.move_to_end(key)
+            print("⚡ DEEPSEEK: Using cached analysis")
+            return cached
+        
         try:
             print("🤖 DEEPSEEK: Calling API...")
             
             # Simple prompt
+            issues_text = "\n".join(
+                f"- {issue.get('title', '')}: {(issue.get('description') or '')[:100]}"
+                for issue in issues[:5]
+            )
             prompt = f"""Analyze these web accessibility results:
 
 URL: {url}
@@ -114,11 +146,11 @@ Score: {score}/100
 Issues: {len(issues)}
 
 Top issues:
-{chr(10).join([f"- {issue.get('title')}: {issue.get('description', '')[:100]}" for issue in issues[:5]])}
+{issues_text}
 
 Provide JSON with: priority_issues[], summary, next_steps[], estimated_effort"""
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="deepseek-chat",
                 messages=[
                     {"role": "system", "content": "You are an accessibility expert. Provide practical advice."},
@@ -135,16 +167,14 @@ Provide JSON with: priority_issues[], summary, next_steps[], estimated_effort"""
             try:
                 # Find JSON in response
                 start = content.find('{')
-                end = content.rfind('}') + 1
-                if start != -1 and end != 0:
-                    json_str = content[start:end]
-                    data = json.loads(json_str)
+                if start != -1:
+                    data, _ = _DECODER.raw_decode(content, start)
                     data["ai_source"] = "DeepSeek AI (Real)"
-                    return data
-            except:
+                    return self._cache_store(key, data)
+            except ValueError:
                 pass
             
-            # If JSON fails, return text
+            # If JSON fails, return text (not cached - a retry may parse)
             return {
                 "summary": f"DeepSeek AI Analysis: {content[:200]}...",
                 "ai_source": "DeepSeek AI (Real - Text)",
@@ -1,13 +1,16 @@
 # app.py - UPDATED WITH REAL CHECKER
-from fastapi import FastAPI, Request, Form, File, UploadFile
+from fastapi import FastAPI, Request, Form, File, UploadFile, Body
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, ORJSONResponse
 import aiohttp
 import asyncio
-from typing import Optional
+from typing import Optional, List
 import os
 import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from compliance_tracker import UniversityComplianceTracker
 from datetime import datetime
 from pdf_analyzer import PDFAccessibilityChecker
@@ -27,8 +30,14 @@ except ImportError as e:
     print(f"⚠️ Could not import AccessibilityChecker: {e}")
     # Create a dummy fallback
     class DummyChecker:
-        async def check_url(self, url):
+        async def check_url(self, url, include_nodes=True):
             return {"url": url, "score": 0, "issues": [], "summary": "Checker not available", "error": "Import failed"}
+        
+        async def check_urls(self, urls):
+            return [await self.check_url(url) for url in urls]
+        
+        async def close(self):
+            pass
 
 app = FastAPI(title="A11y Wizard", description="Accessibility Grader")
 
@@ -43,6 +52,20 @@ else:
     checker = DummyChecker()
     print("⚠️ Running with dummy checker - install dependencies for real analysis")
 
+# Document parsing is CPU-bound - run it in worker processes, not the event loop
+def _new_pdf_executor():
+    # spawn: don't fork a process that already runs uvicorn/aiohttp/Playwright threads
+    return ProcessPoolExecutor(max_workers=os.cpu_count(),
+                               mp_context=multiprocessing.get_context("spawn"))
+
+pdf_executor = _new_pdf_executor()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release the shared browser and worker processes on shutdown"""
+    await checker.close()
+    pdf_executor.shutdown(wait=False)
+
 # Homepage
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -56,34 +79,42 @@ async def analyze_page(request: Request):
     return templates.TemplateResponse("analyze.html", {"request": request})
 
 # REAL URL analysis endpoint - NO MORE DUMMY DATA
-@app.post("/analyze/url")
+@app.post("/analyze/url", response_class=ORJSONResponse)
 async def analyze_url(url: str = Form(...)):
     try:
-        checker = AccessibilityChecker()
         results = await checker.check_url(url)
         
         if results.get("score") == 0 and "blocked" in results.get("summary", "").lower():
             # Return user-friendly error
-            return JSONResponse({
+            return ORJSONResponse({
                 "error": "Website blocked the accessibility scanner. Try a different site or use document upload.",
                 "score": 0,
                 "issues": [],
                 "summary": "Blocked by website security"
             })
         
-        return JSONResponse(results)
+        return ORJSONResponse(results)
         
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
+
+# Batch URL analysis - pages run in parallel on the shared browser
+@app.post("/analyze/urls", response_class=ORJSONResponse)
+async def analyze_urls(urls: List[str] = Body(...)):
+    try:
+        results = await checker.check_urls(urls)
+        return ORJSONResponse(results)
+        
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 # Add new endpoint for AI-only analysis
 @app.post("/analyze/ai")
 async def analyze_with_ai(request: Request, url: str = Form(...)):
     """Get analysis for existing results"""
     try:
-        # First get regular analysis
-        checker = AccessibilityChecker()
-        results = await checker.check_url(url)
+        # First get regular analysis (the AI prompt only uses titles/descriptions)
+        results = await checker.check_url(url, include_nodes=False)
         
         # Then get AI analysis
         if ai_analyzer.available:
@@ -106,31 +137,41 @@ async def analyze_with_ai(request: Request, url: str = Form(...)):
             
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
-@app.post("/analyze/pdf")
+@app.post("/analyze/pdf", response_class=ORJSONResponse)
 async def analyze_pdf(request: Request, pdf_file: UploadFile = File(...)):
     """Analyze a document for accessibility issues"""
+    global pdf_executor
     try:
         # Check file type
         allowed_types = ['.pdf', '.doc', '.docx', '.txt']
         file_ext = os.path.splitext(pdf_file.filename)[1].lower()
         
         if file_ext not in allowed_types:
-            return JSONResponse({
+            return ORJSONResponse({
                 "error": f"File type {file_ext} not supported",
                 "score": 0,
                 "issues": [],
                 "summary": f"Unsupported file type: {file_ext}"
             }, status_code=400)
         
-        # Save uploaded file temporarily
+        # Save uploaded file temporarily (streamed in 1 MiB chunks)
         with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            content = await pdf_file.read()
-            tmp_file.write(content)
+            while chunk := await pdf_file.read(1 << 20):
+                tmp_file.write(chunk)
             tmp_path = tmp_file.name
         
-        # Analyze the document
+        # Analyze the document in a worker process
         checker = PDFAccessibilityChecker()
-        results = checker.analyze_document(tmp_path, pdf_file.filename)
+        executor = pdf_executor
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(executor, checker.analyze_document, tmp_path, pdf_file.filename)
+        except BrokenProcessPool:
+            # A worker died (OOM, parser crash) - replace the pool so later uploads work
+            if pdf_executor is executor:
+                pdf_executor = _new_pdf_executor()
+                executor.shutdown(wait=False)
+            raise
         
         # DETERMINE DOCUMENT TYPE FOR AI
         if file_ext == '.pdf':
@@ -146,15 +187,15 @@ async def analyze_pdf(request: Request, pdf_file: UploadFile = File(...)):
         
         # Clean up temp file
         try:
-            os.unlink(tmp_path)
+            await asyncio.to_thread(os.unlink, tmp_path)
         except:
             pass
         
         print(f"✅ PDF analysis complete. Returning results with AI: {results.get('ai_available', False)}")
-        return JSONResponse(results)
+        return ORJSONResponse(results)
         
     except Exception as e:
-        return JSONResponse({
+        return ORJSONResponse({
             "error": f"Failed to analyze document: {str(e)}",
             "score": 0,
             "issues": [],
@@ -180,7 +221,7 @@ async def health():
         "service": "A11y Wizard"
     }
 
-@app.post("/analyze/url/debug")
+@app.post("/analyze/url/debug", response_class=ORJSONResponse)
 async def analyze_url_debug(request: Request, url: str = Form(...)):
     """Debug endpoint to see raw axe-core data"""
     try:
@@ -189,12 +230,17 @@ async def analyze_url_debug(request: Request, url: str = Form(...)):
         
         if hasattr(checker, '_check_with_playwright'):
             # Get raw data
+            from playwright.async_api import async_playwright
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
                 page = await browser.new_page()
                 
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(2000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                try:
+                    await page.wait_for_load_state("load", timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
                 
                 from axe_core_python.async_playwright import Axe
                 axe = Axe()
@@ -203,7 +249,7 @@ async def analyze_url_debug(request: Request, url: str = Form(...)):
                 await browser.close()
                 
                 # Show everything
-                return JSONResponse({
+                return ORJSONResponse({
                     "url": url,
                     "raw_violations_count": len(raw_results.get("violations", [])),
                     "raw_incomplete_count": len(raw_results.get("incomplete", [])),
@@ -221,24 +267,29 @@ async def analyze_url_debug(request: Request, url: str = Form(...)):
                     "full_violations": raw_results.get("violations", [])
                 })
         
-        return JSONResponse({"error": "Playwright not available"})
+        return ORJSONResponse({"error": "Playwright not available"})
         
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
     
-@app.post("/debug/axe-raw")
+@app.post("/debug/axe-raw", response_class=ORJSONResponse)
 async def debug_axe_raw(request: Request, url: str = Form(...)):
     """Get raw axe-core data for debugging"""
     try:
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
+        from playwright.async_api import async_playwright
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             page = await browser.new_page()
             
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            await page.wait_for_timeout(3000)
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            try:
+                await page.wait_for_load_state("load", timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
             
             from axe_core_python.async_playwright import Axe
             axe = Axe()
@@ -251,7 +302,7 @@ async def debug_axe_raw(request: Request, url: str = Form(...)):
             incomplete = raw_results.get("incomplete", [])
             passes = raw_results.get("passes", [])
             
-            return JSONResponse({
+            return ORJSONResponse({
                 "url": url,
                 "summary": {
                     "total_violations": len(violations),
@@ -286,4 +337,4 @@ async def debug_axe_raw(request: Request, url: str = Form(...)):
             })
             
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
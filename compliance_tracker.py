@@ -1,15 +1,27 @@
 # compliance_tracker.py
 import json
 import csv
-from typing import Dict, List
+import gzip
+import io
+from typing import Dict
 import os
 from datetime import datetime, timedelta  # <-- Add timedelta here
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Write buffer for report files
+WRITE_BUFFER = 1 << 20
+
 class UniversityComplianceTracker:
     """Track accessibility compliance for university audits"""
     
-    def __init__(self, output_dir="compliance_reports"):
+    def __init__(self, output_dir="compliance_reports", archive_gzip=False):
         self.output_dir = output_dir
+        self.archive_gzip = archive_gzip  # Also keep a compressed .json.gz copy
         os.makedirs(output_dir, exist_ok=True)
     
     def generate_report(self, url: str, results: Dict, department: str = "") -> str:
@@ -17,6 +29,16 @@ class UniversityComplianceTracker:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{self.output_dir}/compliance_{timestamp}.json"
         
+        # One pass over the issues for all report statistics
+        issues = results.get("issues", [])
+        critical_count = 0
+        has_critical_aa = False
+        for issue in issues:
+            if issue.get("type") == "critical":
+                critical_count += 1
+                if not has_critical_aa and "wcag2aa" in issue.get("tags", ()):
+                    has_critical_aa = True
+        
         report = {
             "institution": "University Accessibility Audit",
             "timestamp": timestamp,
@@ -24,10 +46,10 @@ class UniversityComplianceTracker:
             "department": department,
             "score": results.get("score", 0),
             "compliance_status": self._get_compliance_status(results.get("score", 0)),
-            "wcag_level": self._determine_wcag_level(results.get("issues", [])),
-            "critical_issues": len([i for i in results.get("issues", []) if i.get("type") == "critical"]),
-            "total_issues": len(results.get("issues", [])),
-            "detailed_issues": results.get("issues", []),
+            "wcag_level": self._determine_wcag_level(has_critical_aa),
+            "critical_issues": critical_count,
+            "total_issues": len(issues),
+            "detailed_issues": issues,
             "auditor": "A11y Wizard",
             "next_audit_date": self._get_next_audit_date(),
             "legal_references": [
@@ -38,8 +60,17 @@ class UniversityComplianceTracker:
             ]
         }
         
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(report, indent=2).encode()
+        
+        with open(filename, 'wb', buffering=WRITE_BUFFER) as f:
+            f.write(data)
+        
+        if self.archive_gzip:
+            with gzip.open(f"{filename}.gz", 'wb', compresslevel=1) as f:
+                f.write(data)
         
         # Also generate CSV for spreadsheets
         self._generate_csv_report(report, timestamp)
@@ -59,13 +90,11 @@ class UniversityComplianceTracker:
         else:
             return "NON-COMPLIANT - Critical Remediation Required"
     
-    def _determine_wcag_level(self, issues: List) -> str:
+    def _determine_wcag_level(self, has_critical_aa: bool) -> str:
         """Determine which WCAG level the site meets"""
-        # Check issue tags to determine compliance level
-        for issue in issues:
-            tags = issue.get("tags", [])
-            if "wcag2aa" in tags and issue.get("type") == "critical":
-                return "WCAG 2.0 A (Minimum)"
+        # Any critical issue tagged wcag2aa means AA isn't met
+        if has_critical_aa:
+            return "WCAG 2.0 A (Minimum)"
         
         # If no critical AA issues, assume AA
         return "WCAG 2.1 AA (Target)"
@@ -80,45 +109,50 @@ class UniversityComplianceTracker:
         """Generate CSV for spreadsheet import"""
         csv_file = f"{self.output_dir}/compliance_{timestamp}.csv"
         
-        with open(csv_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            # Header
-            writer.writerow(["University Accessibility Compliance Report"])
-            writer.writerow(["Generated:", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-            writer.writerow([])
-            
-            # Summary
-            writer.writerow(["SUMMARY"])
-            writer.writerow(["URL", report["url"]])
-            writer.writerow(["Department", report["department"]])
-            writer.writerow(["Score", f"{report['score']}/100"])
-            writer.writerow(["Compliance Status", report["compliance_status"]])
-            writer.writerow(["WCAG Level", report["wcag_level"]])
-            writer.writerow(["Critical Issues", report["critical_issues"]])
-            writer.writerow(["Total Issues", report["total_issues"]])
-            writer.writerow(["Next Audit Due", report["next_audit_date"]])
-            writer.writerow([])
-            
-            # Issues detail
-            writer.writerow(["DETAILED ISSUES"])
-            writer.writerow(["Type", "Title", "Description", "WCAG Criteria", "Fix Required", "Due Date"])
-            
-            for issue in report["detailed_issues"]:
-                # Determine due date based on severity
-                severity = issue.get("type", "warning")
-                if severity == "critical":
-                    due_date = "IMMEDIATE"
-                elif severity == "warning":
-                    due_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-                else:
-                    due_date = (datetime.now() + timedelta(days=60)).strftime("%Y-%m-%d")
-                
-                writer.writerow([
-                    issue.get("type", "").upper(),
-                    issue.get("title", ""),
-                    issue.get("description", "")[:100],
-                    issue.get("category", "General"),
-                    issue.get("fix", "Review required"),
-                    due_date
-                ])
+        # Due dates by severity, computed once for all issues
+        now = datetime.now()
+        info_due = (now + timedelta(days=60)).strftime("%Y-%m-%d")
+        due_map = {
+            "critical": "IMMEDIATE",
+            "warning": (now + timedelta(days=30)).strftime("%Y-%m-%d")
+        }
+        
+        # Build the whole CSV in memory, then write it in one call
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        
+        # Header
+        writer.writerow(["University Accessibility Compliance Report"])
+        writer.writerow(["Generated:", now.strftime("%Y-%m-%d %H:%M:%S")])
+        writer.writerow([])
+        
+        # Summary
+        writer.writerow(["SUMMARY"])
+        writer.writerow(["URL", report["url"]])
+        writer.writerow(["Department", report["department"]])
+        writer.writerow(["Score", f"{report['score']}/100"])
+        writer.writerow(["Compliance Status", report["compliance_status"]])
+        writer.writerow(["WCAG Level", report["wcag_level"]])
+        writer.writerow(["Critical Issues", report["critical_issues"]])
+        writer.writerow(["Total Issues", report["total_issues"]])
+        writer.writerow(["Next Audit Due", report["next_audit_date"]])
+        writer.writerow([])
+        
+        # Issues detail
+        writer.writerow(["DETAILED ISSUES"])
+        writer.writerow(["Type", "Title", "Description", "WCAG Criteria", "Fix Required", "Due Date"])
+        
+        writer.writerows(
+            (
+                issue.get("type", "").upper(),
+                issue.get("title", ""),
+                issue.get("description", "")[:100],
+                issue.get("category", "General"),
+                issue.get("fix", "Review required"),
+                due_map.get(issue.get("type", "warning"), info_due)  # Due date by severity
+            )
+            for issue in report["detailed_issues"]
+        )
+        
+        with open(csv_file, 'w', newline='', buffering=WRITE_BUFFER) as f:
+            f.write(buf.getvalue())
@@ -6,6 +6,24 @@ import PyPDF2
 from docx import Document
 import re
 
+try:
+    import fitz  # PyMuPDF - C-backed, much faster text extraction than PyPDF2
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    print("⚠️ PyMuPDF not available, using PyPDF2 for PDFs")
+
+# Heading style names, e.g. "Heading 2" (level is optional, as in plain "Heading")
+_HEADING_RE = re.compile(r'Heading(?:\s+(\d+)\s*$)?')
+
+# WordprocessingML hyperlinks: <w:hyperlink> elements, or HYPERLINK field codes
+# in <w:fldSimple w:instr="..."> / <w:instrText>
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+HYPERLINK_Q = _W + 'hyperlink'
+FLDSIMPLE_Q = _W + 'fldSimple'
+INSTRTEXT_Q = _W + 'instrText'
+INSTR_Q = _W + 'instr'
+
 class PDFAccessibilityChecker:
     """Check PDF and Word documents for accessibility issues"""
     
@@ -16,12 +34,21 @@ class PDFAccessibilityChecker:
         try:
             if file_ext == '.pdf':
                 text = []
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for i, page in enumerate(pdf_reader.pages[:5]):  # First 5 pages only
-                        page_text = page.extract_text()
-                        if page_text and page_text.strip():
-                            text.append(f"--- Page {i+1} ---\n{page_text[:1000]}")  # Limit per page
+                if PYMUPDF_AVAILABLE:
+                    with fitz.open(file_path) as doc:
+                        for i, page in enumerate(doc):
+                            if i >= 5:  # First 5 pages only
+                                break
+                            page_text = page.get_text("text")
+                            if page_text and page_text.strip():
+                                text.append(f"--- Page {i+1} ---\n{page_text[:1000]}")  # Limit per page
+                else:
+                    with open(file_path, 'rb') as file:
+                        pdf_reader = PyPDF2.PdfReader(file)
+                        for i, page in enumerate(pdf_reader.pages[:5]):  # First 5 pages only
+                            page_text = page.extract_text()
+                            if page_text and page_text.strip():
+                                text.append(f"--- Page {i+1} ---\n{page_text[:1000]}")  # Limit per page
                 return "\n\n".join(text) if text else "No extractable text found"
             
             elif file_ext in ['.doc', '.docx']:
@@ -55,47 +82,20 @@ class PDFAccessibilityChecker:
         else:
             return self._error_result(filename, f"Unsupported file type: {file_ext}")
     
-        def extract_document_text(self, file_path: str, filename: str) -> str:
-            """Extract text content from document for AI analysis"""
-            file_ext = os.path.splitext(filename)[1].lower()
-            
-            try:
-                if file_ext == '.pdf':
-                    text = []
-                    with open(file_path, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        for i, page in enumerate(pdf_reader.pages[:5]):  # First 5 pages only
-                            page_text = page.extract_text()
-                            if page_text and page_text.strip():
-                                text.append(f"--- Page {i+1} ---\n{page_text[:1000]}")  # Limit per page
-                    return "\n\n".join(text) if text else "No extractable text found"
-                
-                elif file_ext in ['.doc', '.docx']:
-                    doc = Document(file_path)
-                    paragraphs = []
-                    for i, para in enumerate(doc.paragraphs[:50]):  # First 50 paragraphs
-                        if para.text and para.text.strip():
-                            paragraphs.append(para.text[:500])  # Limit per paragraph
-                    return "\n".join(paragraphs) if paragraphs else "No text content found"
-                
-                elif file_ext == '.txt':
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                        return file.read(2000)  # First 2000 chars
-                
-                return "Unsupported file type for text extraction"
-            
-            except Exception as e:
-                return f"Error extracting text: {str(e)[:200]}"
-                
-        
-        def _analyze_word(self, file_path: str, filename: str) -> Dict[str, Any]:
-            """Analyze Word document for accessibility issues - ENHANCED"""
-            issues = []
+    def _analyze_word(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """Analyze Word document for accessibility issues - ENHANCED"""
+        issues = []
         
         try:
             doc = Document(file_path)
             core_props = doc.core_properties
             
+            # python-docx rebuilds these wrapper lists on every access - build once
+            paragraphs = doc.paragraphs
+            inline_shapes = list(doc.inline_shapes)
+            tables = doc.tables
+            paragraph_count = len(paragraphs)
+            
             # 1. Check for document title
             if not core_props.title:
                 issues.append({
@@ -112,16 +112,14 @@ class PDFAccessibilityChecker:
             headings = []
             heading_levels = set()
             
-            for paragraph in doc.paragraphs:
+            for paragraph in paragraphs:
                 style_name = paragraph.style.name
-                if style_name.startswith('Heading'):
+                m = _HEADING_RE.match(style_name)
+                if m:
                     headings.append(style_name)
                     # Extract heading level
-                    try:
-                        level = int(style_name.split()[-1])
-                        heading_levels.add(level)
-                    except:
-                        pass
+                    if m.group(1):
+                        heading_levels.add(int(m.group(1)))
             
             if not headings:
                 issues.append({
@@ -145,28 +143,23 @@ class PDFAccessibilityChecker:
                         "category": "Structure"
                     })
                 
-                # Check for skipped heading levels
-                if heading_levels and max(heading_levels) > 1:
-                    for i in range(1, max(heading_levels)):
-                        if i not in heading_levels and i+1 in heading_levels:
-                            issues.append({
-                                "type": "warning",
-                                "title": "Skipped Heading Level",
-                                "count": 1,
-                                "description": f"Heading level {i} skipped (went from H{i-1} to H{i+1})",
-                                "fix": "Maintain sequential heading levels",
-                                "category": "Structure"
-                            })
-                            break
+                # Check for skipped heading levels: first gap between consecutive
+                # levels (0 stands in for "before the first heading")
+                levels = [0] + sorted(heading_levels)
+                skipped = next((b - 1 for a, b in zip(levels, levels[1:]) if b - a > 1), None)
+                if skipped:
+                    issues.append({
+                        "type": "warning",
+                        "title": "Skipped Heading Level",
+                        "count": 1,
+                        "description": f"Heading level {skipped} skipped (went from H{skipped-1} to H{skipped+1})",
+                        "fix": "Maintain sequential heading levels",
+                        "category": "Structure"
+                    })
             
             # 3. Check for alt text on images
-            images_without_alt = []
-            for shape in doc.inline_shapes:
-                # Check if shape has alt text (basic check)
-                # Note: python-docx doesn't have direct alt text access
-                images_without_alt.append(shape)
-            
-            image_count = len(doc.inline_shapes)
+            # Note: python-docx doesn't have direct alt text access, so every image is flagged
+            image_count = len(inline_shapes)
             if image_count > 0:
                 issues.append({
                     "type": "warning" if image_count < 5 else "critical",
@@ -179,19 +172,19 @@ class PDFAccessibilityChecker:
                 })
             
             # 4. Check for tables
-            table_count = len(doc.tables)
+            table_count = len(tables)
             if table_count > 0:
                 tables_without_headers = []
-                for table in doc.tables:
+                for table in tables:
                     # Basic check: first row should be different (header)
                     if len(table.rows) > 0:
                         first_row = table.rows[0]
-                        # Simple heuristic: check if first cell has bold or different style
-                        has_header_style = False
-                        if first_row.cells:
-                            cell_text = first_row.cells[0].text.strip()
-                            if cell_text and cell_text.upper() == cell_text:  # ALL CAPS often indicates header
-                                has_header_style = True
+                        # Simple heuristic: any first-row cell with bold text or a header style
+                        has_header_style = any(
+                            any(run.bold for paragraph in cell.paragraphs for run in paragraph.runs)
+                            or (cell.paragraphs and 'Header' in cell.paragraphs[0].style.name)
+                            for cell in first_row.cells
+                        )
                         
                         if not has_header_style:
                             tables_without_headers.append(table)
@@ -206,11 +199,8 @@ class PDFAccessibilityChecker:
                         "category": "Tables"
                     })
             
-            # 5. Check for hyperlinks
-            hyperlink_count = 0
-            for paragraph in doc.paragraphs:
-                if 'HYPERLINK' in paragraph._element.xml:
-                    hyperlink_count += 1
+            # 5. Check for hyperlinks (walk the body tree once, no XML re-serialization)
+            hyperlink_count = self._count_hyperlinks(doc.element.body)
             
             if hyperlink_count > 0:
                 issues.append({
@@ -234,7 +224,7 @@ class PDFAccessibilityChecker:
                 })
             
             # Calculate score
-            score = self._calculate_score(issues, len(doc.paragraphs))
+            score = self._calculate_score(issues, paragraph_count)
             
             # Generate summary
             summary_parts = []
@@ -254,7 +244,7 @@ class PDFAccessibilityChecker:
                 "score": score,
                 "issues": issues,
                 "document_info": {
-                    "paragraphs": len(doc.paragraphs),
+                    "paragraphs": paragraph_count,
                     "headings": len(headings),
                     "heading_levels": list(heading_levels),
                     "images": image_count,
@@ -271,50 +261,88 @@ class PDFAccessibilityChecker:
         except Exception as e:
             return self._error_result(filename, f"Word analysis error: {str(e)}")
     
+    def _count_hyperlinks(self, body) -> int:
+        """Count <w:hyperlink> elements and HYPERLINK field codes in one tree walk"""
+        count = 0
+        for element in body.iter(HYPERLINK_Q, FLDSIMPLE_Q, INSTRTEXT_Q):
+            if element.tag == HYPERLINK_Q:
+                count += 1
+            elif element.tag == FLDSIMPLE_Q:
+                if (element.get(INSTR_Q) or '').lstrip().startswith('HYPERLINK'):
+                    count += 1
+            elif (element.text or '').lstrip().startswith('HYPERLINK'):
+                count += 1
+        return count
+    
     def _analyze_text(self, file_path: str, filename: str) -> Dict[str, Any]:
         """Analyze plain text file"""
         issues = []
         
         try:
+            # Stream the file once instead of holding it (and a list of its lines) in memory
+            char_count = 0
+            newline_count = 0
+            long_line_count = 0
+            blank_run = 0
+            blank_run_needed = 2
+            excess_blank_lines = False
+            
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
-                lines = content.split('\n')
-                
-                # Very basic text file checks
-                if len(content) > 1000 and '\n\n\n' in content:
-                    issues.append({
-                        "type": "warning",
-                        "title": "Poor Paragraph Spacing",
-                        "count": 1,
-                        "description": "Text file has excessive blank lines",
-                        "fix": "Use consistent single blank lines between paragraphs",
-                        "category": "Formatting"
-                    })
-                
-                # Check line length
-                long_lines = [line for line in lines if len(line) > 100]
-                if long_lines:
-                    issues.append({
-                        "type": "warning",
-                        "title": "Long Lines",
-                        "count": len(long_lines),
-                        "description": f"{len(long_lines)} line(s) exceed 100 characters",
-                        "fix": "Break long lines for better readability",
-                        "category": "Readability"
-                    })
-                
-                score = self._calculate_score(issues, len(lines))
-                
-                return {
-                    "filename": filename,
-                    "score": score,
-                    "issues": issues,
-                    "line_count": len(lines),
-                    "char_count": len(content),
-                    "summary": f"Text file analysis: {len(issues)} issues found",
-                    "method": "text-analysis"
-                }
-                
+                for line in file:
+                    length = len(line)
+                    char_count += length
+                    if line.endswith('\n'):
+                        newline_count += 1
+                        length -= 1
+                    if length > 100:
+                        long_line_count += 1
+                    
+                    # '\n\n\n' = two empty lines after a line break (three at file start)
+                    if line == '\n':
+                        if blank_run == 0:
+                            blank_run_needed = 3 if newline_count == 1 else 2
+                        blank_run += 1
+                        if blank_run >= blank_run_needed:
+                            excess_blank_lines = True
+                    else:
+                        blank_run = 0
+            
+            line_count = newline_count + 1  # Same as len(content.split('\n'))
+            
+            # Very basic text file checks
+            if char_count > 1000 and excess_blank_lines:
+                issues.append({
+                    "type": "warning",
+                    "title": "Poor Paragraph Spacing",
+                    "count": 1,
+                    "description": "Text file has excessive blank lines",
+                    "fix": "Use consistent single blank lines between paragraphs",
+                    "category": "Formatting"
+                })
+            
+            # Check line length
+            if long_line_count:
+                issues.append({
+                    "type": "warning",
+                    "title": "Long Lines",
+                    "count": long_line_count,
+                    "description": f"{long_line_count} line(s) exceed 100 characters",
+                    "fix": "Break long lines for better readability",
+                    "category": "Readability"
+                })
+            
+            score = self._calculate_score(issues, line_count)
+            
+            return {
+                "filename": filename,
+                "score": score,
+                "issues": issues,
+                "line_count": line_count,
+                "char_count": char_count,
+                "summary": f"Text file analysis: {len(issues)} issues found",
+                "method": "text-analysis"
+            }
+            
         except Exception as e:
             return self._error_result(filename, f"Text analysis error: {str(e)}")
     
@@ -343,24 +371,6 @@ class PDFAccessibilityChecker:
             
         return score
     
-    def _error_result(self, filename: str, error: str):
-        """Create error result"""
-        return {
-            "filename": filename,
-            "score": 0,
-            "issues": [{
-                "type": "critical",
-                "title": "Analysis Failed",
-                "count": 1,
-                "description": error[:100],
-                "fix": "Try a different file or format",
-                "category": "Error"
-            }],
-            "summary": f"Analysis failed: {error[:50]}",
-            "method": "error"
-        }
-
-
     def _error_result(self, filename: str, error: str) -> Dict[str, Any]:
         """Create error result"""
         return {
@@ -378,69 +388,98 @@ class PDFAccessibilityChecker:
             "method": "error"
         }
     
+    def _read_pdf_info(self, file_path: str) -> Dict[str, Any]:
+        """Read title, outline, page count and text presence from a PDF"""
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(file_path) as doc:
+                # Tagged PDFs carry real text - skip extraction entirely
+                tagged = doc.xref_get_key(doc.pdf_catalog(), "MarkInfo/Marked")[1] == "true"
+                # flags=0: plain text only, no image/ligature/whitespace processing
+                has_text = tagged or any(
+                    doc[i].get_text("text", flags=0).strip()
+                    for i in range(min(3, doc.page_count))  # Check first 3 pages
+                )
+                return {
+                    "title": (doc.metadata or {}).get('title'),
+                    "has_outline": bool(doc.get_toc()),
+                    "page_count": doc.page_count,
+                    "has_text": has_text
+                }
+        
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            root = pdf_reader.trailer["/Root"]
+            mark_info = root["/MarkInfo"] if "/MarkInfo" in root else {}  # [] resolves indirect refs
+            marked = mark_info.get("/Marked")
+            # BooleanObject has no __bool__ in PyPDF2 3.x - compare the resolved value
+            tagged = marked is not None and marked.get_object() == True
+            has_text = tagged or any(
+                (page.extract_text() or "").strip()
+                for page in pdf_reader.pages[:3]  # Check first 3 pages
+            )
+            return {
+                "title": pdf_reader.metadata.get('/Title') if pdf_reader.metadata else None,
+                "has_outline": bool(pdf_reader.outline),
+                "page_count": len(pdf_reader.pages),
+                "has_text": has_text
+            }
+    
     def _analyze_pdf(self, file_path: str, filename: str) -> Dict[str, Any]:
         """Analyze PDF for accessibility issues - SIMPLE VERSION"""
         issues = []
         
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Basic checks
-                if not pdf_reader.metadata or not pdf_reader.metadata.get('/Title'):
-                    issues.append({
-                        "type": "critical",
-                        "title": "Missing Document Title",
-                        "count": 1,
-                        "description": "PDF missing title in document properties",
-                        "fix": "Add a title in PDF properties (File → Properties)",
-                        "category": "Document Structure"
-                    })
-                
-                # Check for bookmarks/outline (navigation)
-                if not pdf_reader.outline:
-                    issues.append({
-                        "type": "warning",
-                        "title": "No Document Bookmarks",
-                        "count": 1,
-                        "description": "PDF lacks bookmarks for navigation",
-                        "fix": "Add bookmarks for major sections",
-                        "category": "Navigation"
-                    })
-                
-                # Check page count
-                page_count = len(pdf_reader.pages)
-                
-                # Try to extract text
-                has_text = False
-                for page in pdf_reader.pages[:3]:  # Check first 3 pages
-                    text = page.extract_text()
-                    if text and len(text.strip()) > 0:
-                        has_text = True
-                        break
-                
-                if not has_text:
-                    issues.append({
-                        "type": "critical",
-                        "title": "Scanned/Image PDF",
-                        "count": 1,
-                        "description": "PDF appears to be scanned images without selectable text",
-                        "fix": "Use OCR to create searchable text",
-                        "category": "Text"
-                    })
-                
-                # Calculate score
-                score = self._calculate_score(issues, page_count)
-                
-                return {
-                    "filename": filename,
-                    "score": score,
-                    "issues": issues,
-                    "page_count": page_count,
-                    "has_text": has_text,
-                    "summary": f"PDF analysis: {len(issues)} issues found across {page_count} pages",
-                    "method": "pdf-analysis"
-                }
-                
+            info = self._read_pdf_info(file_path)
+            
+            # Basic checks
+            if not info["title"]:
+                issues.append({
+                    "type": "critical",
+                    "title": "Missing Document Title",
+                    "count": 1,
+                    "description": "PDF missing title in document properties",
+                    "fix": "Add a title in PDF properties (File → Properties)",
+                    "category": "Document Structure"
+                })
+            
+            # Check for bookmarks/outline (navigation)
+            if not info["has_outline"]:
+                issues.append({
+                    "type": "warning",
+                    "title": "No Document Bookmarks",
+                    "count": 1,
+                    "description": "PDF lacks bookmarks for navigation",
+                    "fix": "Add bookmarks for major sections",
+                    "category": "Navigation"
+                })
+            
+            # Check page count
+            page_count = info["page_count"]
+            
+            # Check for extractable text
+            has_text = info["has_text"]
+            if not has_text:
+                issues.append({
+                    "type": "critical",
+                    "title": "Scanned/Image PDF",
+                    "count": 1,
+                    "description": "PDF appears to be scanned images without selectable text",
+                    "fix": "Use OCR to create searchable text",
+                    "category": "Text"
+                })
+            
+            # Calculate score
+            score = self._calculate_score(issues, page_count)
+            
+            return {
+                "filename": filename,
+                "score": score,
+                "issues": issues,
+                "page_count": page_count,
+                "has_text": has_text,
+                "summary": f"PDF analysis: {len(issues)} issues found across {page_count} pages",
+                "method": "pdf-analysis"
+            }
+            
         except Exception as e:
             return self._error_result(filename, f"PDF analysis error: {str(e)}")
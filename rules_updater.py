@@ -1,8 +1,20 @@
 # rules_updater.py
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Only the top of each page is scanned (e.g. to spot the WCAG version).
+# Streaming saves bytes on the plain requests.Session path only: on a cache
+# miss, requests_cache downloads and stores the whole body anyway.
+SCAN_BYTES = 32 * 1024
+
 class AccessibilityRulesUpdater:
     """Keep accessibility rules up-to-date for university compliance"""
     
@@ -13,20 +25,45 @@ class AccessibilityRulesUpdater:
         "section508": "https://www.access-board.gov/ict/"
     }
     
+    def __init__(self):
+        # Rule pages change rarely - cache responses on disk for a day
+        if REQUESTS_CACHE_AVAILABLE:
+            self.session = requests_cache.CachedSession('.a11y_wizard_cache', expire_after=86400)
+        else:
+            self.session = requests.Session()
+    
+    def _fetch_head(self, url: str) -> str:
+        """Return the first SCAN_BYTES of a page as text"""
+        response = self.session.get(url, timeout=10, stream=True)
+        try:
+            return next(response.iter_content(SCAN_BYTES), b"").decode('utf-8', 'ignore')
+        finally:
+            response.close()
+    
     def check_for_updates(self):
         """Check if rules need updating"""
         print("🔍 Checking for accessibility rule updates...")
         
-        # Check WCAG version
-        try:
-            response = requests.get(self.UPDATE_URLS["wcag"], timeout=10)
-            # Parse for latest version (simplified)
-            if "WCAG 2.2" in response.text:
-                print("✅ Using latest WCAG 2.2")
+        # Fetch all sources in parallel (network I/O releases the GIL)
+        with ThreadPoolExecutor(max_workers=len(self.UPDATE_URLS)) as executor:
+            futures = {name: executor.submit(self._fetch_head, url)
+                       for name, url in self.UPDATE_URLS.items()}
+        
+        for name, future in futures.items():
+            try:
+                head = future.result()
+            except Exception:
+                print(f"⚠️ Could not check {name} updates")
+                continue
+            
+            if name == "wcag":
+                # Parse for latest version (simplified)
+                if "WCAG 2.2" in head:
+                    print("✅ Using latest WCAG 2.2")
+                else:
+                    print("⚠️ Newer WCAG version may be available")
             else:
-                print("⚠️ Newer WCAG version may be available")
-        except:
-            print("⚠️ Could not check WCAG updates")
+                print(f"✅ Reached {name} update source")
         
         # Check for known upcoming changes
         upcoming_changes = [
@@ -1,4 +1,50 @@
 # scoring.py - Better scoring logic
+from bisect import bisect_right
+
+# Optional (not in requirements.txt): speeds up scoring of very large reports
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Impact weights (critical is very important)
+_IMPACT_W = {"critical": 0.8, "serious": 0.6, "moderate": 0.4}  # minor/other: 0.2
+
+# Precomputed decay factors for typical node counts
+_POW09 = tuple(0.9 ** i for i in range(256))
+_POW095 = tuple(0.95 ** i for i in range(256))
+
+# Grade boundaries (lower bound of each grade after F) and grades, lowest first
+_GRADE_THRESHOLDS = (50, 60, 70, 75, 80, 85, 90, 95)
+_GRADES = (
+    ("F", "🚨 Very Poor"),
+    ("D", "🚨 Poor"),
+    ("C", "🔧 Needs Work"),
+    ("B-", "⚠️ Below Average"),
+    ("B", "⚠️ Average"),
+    ("B+", "⚠️ Above Average"),
+    ("A-", "👍 Good"),
+    ("A", "✅ Very Good"),
+    ("A+", "🏆 Excellent")
+)
+
+# Above this many violations the NumPy path beats the Python loop
+_VECTORIZE_MIN = 64
+
+def _vectorized_deduction(violations):
+    """Total violation deduction, computed with NumPy for large reports"""
+    impacts = np.array([v.get("impact", "moderate").lower() for v in violations])
+    counts = np.fromiter((len(v.get("nodes", [])) for v in violations),
+                         dtype=np.int64, count=len(violations))
+    weights = np.select(
+        [impacts == "critical", impacts == "serious", impacts == "moderate"],
+        [0.8, 0.6, 0.4],
+        default=0.2
+    )
+    node_factors = np.minimum(1.0, 0.2 + 0.8 * (1 - np.power(0.9, counts)))
+    return float((10 * weights * node_factors).sum())
+
 class AccessibilityScorer:
     """Better, more nuanced scoring system"""
     
@@ -17,30 +63,29 @@ class AccessibilityScorer:
         # Weight by impact and prevalence
         base_score = 100
         
-        for violation in violations:
-            impact = violation.get("impact", "moderate").lower()
-            nodes_count = len(violation.get("nodes", []))
-            
-            # Impact weights
-            if impact == "critical":
-                weight = 0.8  # Very important
-            elif impact == "serious":
-                weight = 0.6
-            elif impact == "moderate":
-                weight = 0.4
-            else:  # minor
-                weight = 0.2
-            
-            # Node count factor (logarithmic - first few matter most)
-            node_factor = min(1.0, 0.2 + (0.8 * (1 - 0.9 ** nodes_count)))
-            
-            # Deduct score
-            deduction = 10 * weight * node_factor
-            base_score -= deduction
-        
+        if NUMPY_AVAILABLE and len(violations) > _VECTORIZE_MIN:
+            base_score -= _vectorized_deduction(violations)
+        else:
+            for violation in violations:
+                impact = violation.get("impact", "moderate").lower()
+                nodes_count = len(violation.get("nodes", []))
+                
+                # Impact weights
+                weight = _IMPACT_W.get(impact, 0.2)
+                
+                # Node count factor (logarithmic - first few matter most)
+                decay = _POW09[nodes_count] if nodes_count < 256 else 0.9 ** nodes_count
+                node_factor = min(1.0, 0.2 + (0.8 * (1 - decay)))
+                
+                # Deduct score
+                deduction = 10 * weight * node_factor
+                base_score -= deduction
+                
         # Incomplete/warnings have less impact
         for item in incomplete:
-            base_score -= 2 * min(1.0, 0.5 * (1 - 0.95 ** len(item.get("nodes", []))))
+            nodes_count = len(item.get("nodes", []))
+            decay = _POW095[nodes_count] if nodes_count < 256 else 0.95 ** nodes_count
+            base_score -= 2 * min(1.0, 0.5 * (1 - decay))
         
         # Bonus for passes
         pass_bonus = len(passes) * 0.5
@@ -51,21 +96,4 @@ class AccessibilityScorer:
     @staticmethod
     def get_grade(score):
         """Convert score to letter grade"""
-        if score >= 95:
-            return "A+", "🏆 Excellent"
-        elif score >= 90:
-            return "A", "✅ Very Good"
-        elif score >= 85:
-            return "A-", "👍 Good"
-        elif score >= 80:
-            return "B+", "⚠️ Above Average"
-        elif score >= 75:
-            return "B", "⚠️ Average"
-        elif score >= 70:
-            return "B-", "⚠️ Below Average"
-        elif score >= 60:
-            return "C", "🔧 Needs Work"
-        elif score >= 50:
-            return "D", "🚨 Poor"
-        else:
-            return "F", "🚨 Very Poor"
+        return _GRADES[bisect_right(_GRADE_THRESHOLDS, score)]